@@ -0,0 +1,49 @@
+""" The numba version of the approx_interactions scoring kernel, only imported when it is first needed. """
+
+import numba
+import numpy as np
+
+# fastmath without the no-NaN/no-inf assumptions, since missing feature values reach the variance guards
+@numba.njit(parallel=True, fastmath={"contract", "reassoc", "arcp"}, cache=True)
+def score_interactions(shap_ref, Xs, inc, cols):
+    """ Sum the absolute correlation of shap_ref and the given columns of Xs over bins of size inc. """
+
+    nbins = Xs.shape[0] // inc
+
+    # the SHAP side of each bin is the same for every feature, so its sums are only taken once
+    ys = np.empty(nbins*inc)
+    sy = np.zeros(nbins)
+    vy = np.zeros(nbins)
+    for b in range(nbins):
+        start = b*inc
+        sy_b = syy_b = 0.0
+        for k in range(start, start+inc):
+            ys[k] = shap_ref[k] - shap_ref[start]
+            sy_b += ys[k]
+            syy_b += ys[k]*ys[k]
+        sy[b] = sy_b
+        vy[b] = inc*syy_b - sy_b*sy_b
+
+    interactions = np.zeros(Xs.shape[1])
+    for j in numba.prange(len(cols)):
+        f = cols[j]
+        v = 0.0
+        for b in range(nbins):
+            if vy[b] <= 0:
+                continue
+            start = b*inc
+
+            # one streaming pass of running sums, shifted by the first value of the bin so
+            # constant bins have exactly zero variance
+            kx = Xs[start,f]
+            sx = sxx = sxy = 0.0
+            for k in range(start, start+inc):
+                xk = Xs[k,f] - kx
+                sx += xk
+                sxx += xk*xk
+                sxy += xk*ys[k]
+            vx = inc*sxx - sx*sx
+            if vx > 0:
+                v += abs(inc*sxy - sx*sy[b]) / np.sqrt(vx*vy[b])
+        interactions[f] = v
+    return interactions
@@ -1,5 +1,5 @@
 import warnings
-from scipy.stats import gaussian_kde
+from scipy.signal import fftconvolve
 from iml import Instance, Model
 from iml.explanations import AdditiveExplanation
 from iml.links import IdentityLink
@@ -7,9 +7,15 @@ from iml.datatypes import DenseData
 import iml
 import numpy as np
 
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
 try:
     import matplotlib.pyplot as pl
     from matplotlib.colors import LinearSegmentedColormap
+    from matplotlib.collections import PolyCollection
 
     cdict1 = {'red':   ((0.0, 0.11764705882352941, 0.11764705882352941),
                         (1.0, 0.9607843137254902, 0.9607843137254902)),
@@ -21,12 +27,13 @@ try:
                        (1.0, 0.3411764705882353, 0.3411764705882353))
             }
     red_blue = LinearSegmentedColormap('RedBlue', cdict1)
+    red_blue_lut = red_blue(np.arange(red_blue.N))
 except ImportError:
     pass
 
 def dependence_plot(ind, shap_values, features, feature_names=None, display_features=None,
                     interaction_index="auto", color="#ff0052", axis_color="#333333",
-                    dot_size=16, alpha=1, title=None, show=True):
+                    dot_size=16, alpha=1, title=None, show=True, rasterize=False):
     """
     Create a SHAP dependence plot, colored by an interaction feature.
 
@@ -49,19 +56,17 @@ def dependence_plot(ind, shap_values, features, feature_names=None, display_feat
 
     interaction_index : "auto" or int
         The index of the feature used to color the plot.
+
+    rasterize : bool
+        Draw large plots (more than rasterize_min_points points) as a datashader image instead of a scatter plot.
     """
 
     # convert from DataFrames if we got any
-    if str(type(features)) == "<class 'pandas.core.frame.DataFrame'>":
-        if feature_names is None:
-            feature_names = features.columns
-        features = features.as_matrix()
-    if str(type(display_features)) == "<class 'pandas.core.frame.DataFrame'>":
-        if feature_names is None:
-            feature_names = display_features.columns
-        display_features = display_features.as_matrix()
-    elif display_features is None:
+    features, feature_names = _to_ndarray(features, feature_names)
+    if display_features is None:
         display_features = features
+    else:
+        display_features, feature_names = _to_ndarray(display_features, feature_names)
 
     # allow vectors to be passed
     if len(shap_values.shape) == 1:
@@ -74,10 +79,7 @@ def dependence_plot(ind, shap_values, features, feature_names=None, display_feat
     xd = display_features[:,ind]
     s = shap_values[:,ind]
     if type(xd[0]) == str:
-        name_map = {}
-        for i in range(len(xv)):
-            name_map[xd[i]] = xv[i]
-        xnames = list(name_map.keys())
+        xnames,xname_inds = _unique_names(xd)
 
     # allow a single feature name to be passed alone
     if type(feature_names) == str:
@@ -92,20 +94,19 @@ def dependence_plot(ind, shap_values, features, feature_names=None, display_feat
     cv = features[:,interaction_index]
     cd = display_features[:,interaction_index]
     if type(cd[0]) == str:
-        cname_map = {}
-        for i in range(len(cv)):
-            cname_map[cd[i]] = cv[i]
-        cnames = list(cname_map.keys())
-    clow = np.nanpercentile(features[:,interaction_index], 5)
-    chigh = np.nanpercentile(features[:,interaction_index], 95)
+        cnames,cname_inds = _unique_names(cd)
+    clow,chigh = np.nanpercentile(cv, [5, 95])
 
     # the actual scatter plot, TODO: adapt the dot_size to the number of data points
-    pl.scatter(xv, s, s=dot_size, linewidth=0, c=features[:,interaction_index], cmap=red_blue,
-               alpha=alpha, vmin=clow, vmax=chigh)
+    if rasterize and _can_rasterize(len(xv)):
+        _rasterized_scatter(xv, s, cv, red_blue, clow, chigh, dot_size=dot_size, alpha=alpha)
+    else:
+        pl.scatter(xv, s, s=dot_size, linewidth=0, c=features[:,interaction_index], cmap=red_blue,
+                   alpha=alpha, vmin=clow, vmax=chigh)
 
     # draw the color bar
     if type(cd[0]) == str:
-        cb = pl.colorbar(ticks=[cname_map[n] for n in cnames])
+        cb = pl.colorbar(ticks=cv[cname_inds])
         cb.set_ticklabels(cnames)
     else:
         cb = pl.colorbar()
@@ -128,7 +129,7 @@ def dependence_plot(ind, shap_values, features, feature_names=None, display_feat
     for spine in pl.gca().spines.values():
         spine.set_edgecolor(axis_color)
     if type(xd[0]) == str:
-        pl.xticks([name_map[n] for n in xnames], xnames, rotation='vertical', fontsize=11)
+        pl.xticks(xv[xname_inds], xnames, rotation='vertical', fontsize=11)
     if show:
         pl.show()
 
@@ -140,34 +141,68 @@ def approx_interactions(index, shap_values, X):
     """
 
     if X.shape[0] > 10000:
-        a = np.arange(X.shape[0])
-        np.random.shuffle(a)
-        inds = a[:10000]
+        # seed the Generator from the global state so np.random.seed still controls the sample
+        rng = np.random.default_rng(np.random.randint(np.iinfo(np.int32).max))
+        inds = rng.choice(X.shape[0], size=10000, replace=False, shuffle=False)
     else:
         inds = np.arange(X.shape[0])
 
     x = X[inds,index]
-    srt = np.argsort(x)
-    shap_ref = shap_values[inds,index]
-    shap_ref = shap_ref[srt]
-    inc = min(int(len(x)/10.0), 50)
-    interactions = []
-    for i in range(X.shape[1]):
-        val_other = X[inds,i][srt]
-
-        if i == index or np.sum(np.abs(val_other)) < 1e-8:
-            v = 0
-        else:
-            v = 0.0
-            for i in range(0,len(x),inc):
-                if np.std(val_other[i:i+inc]) > 0 and np.std(shap_ref[i:i+inc]) > 0:
-                    v += abs(np.corrcoef(shap_ref[i:i+inc],val_other[i:i+inc])[0,1])
-        interactions.append(v)
+    srt = inds[np.argsort(x)]
+    shap_ref = np.asarray(shap_values[srt,index], dtype=np.float64)
+    inc = max(min(int(len(x)/10.0), 50), 1)
+
+    # gather the sorted rows once, column-major so each feature is a contiguous strip
+    Xs = np.asfortranarray(X[srt], dtype=np.float64)
+
+    # only score the other features that vary, the rest have no correlation to measure
+    skip = (np.ptp(Xs, axis=0) == 0) | (np.sum(np.abs(Xs), axis=0) < 1e-8)
+    skip[index] = True
+    interactions = _score_interactions(shap_ref, Xs, inc, np.nonzero(~skip)[0])
 
     return np.argsort(-np.abs(interactions))
 
+# set to the numba kernel (or False when numba is missing) the first time it is needed
+_numba_score_interactions = None
+
+def _score_interactions(shap_ref, Xs, inc, cols):
+    """ Sum the absolute correlation of shap_ref and the given columns of Xs over bins of size inc.
+
+    This uses the numba kernel when numba is installed, importing and compiling it on first use.
+    """
+
+    global _numba_score_interactions
+    if _numba_score_interactions is None:
+        try:
+            from ._interactions_numba import score_interactions
+            _numba_score_interactions = score_interactions
+        except ImportError:
+            _numba_score_interactions = False
+
+    if _numba_score_interactions is False:
+        return _score_interactions_numpy(shap_ref, Xs, inc, cols)
+    return _numba_score_interactions(shap_ref, Xs, inc, cols)
+
+def _score_interactions_numpy(shap_ref, Xs, inc, cols):
+    """ Sum the absolute correlation of shap_ref and the given columns of Xs over bins of size inc. """
+
+    # reshape the sorted values into (# bins x bin size) so all bins are scored at once
+    nbins = Xs.shape[0] // inc
+    S = shap_ref[:nbins*inc].reshape(nbins, inc)
+    V = Xs[:nbins*inc,cols].reshape(nbins, inc, len(cols))
+
+    # the Pearson correlation of every bin with every feature, skipping bins with zero variance
+    cov = ((V - V.mean(axis=1, keepdims=True)) * (S - S.mean(axis=1, keepdims=True))[:,:,None]).mean(axis=1)
+    denom = V.std(axis=1) * S.std(axis=1)[:,None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = np.where(denom > 0, cov / denom, 0)
+    interactions = np.zeros(Xs.shape[1])
+    interactions[cols] = np.sum(np.abs(corr), axis=0)
+    return interactions
+
 def summary_plot(shap_values, features, feature_names=None, max_display=20, plot_type="dot",
-                 color="#ff0052", axis_color="#333333", title=None, alpha=1, show=True, sort=True):
+                 color="#ff0052", axis_color="#333333", title=None, alpha=1, show=True, sort=True,
+                 rasterize=False):
     """
     Create a SHAP summary plot, colored by feature values when they are provided.
 
@@ -187,14 +222,14 @@ def summary_plot(shap_values, features, feature_names=None, max_display=20, plot
 
     plot_type : "dot" (default) or "violin"
         What type of summary plot to produce
+
+    rasterize : bool
+        Draw the colored dots of large plots (more than rasterize_min_points samples) as datashader images
     """
 
     # convert from a DataFrame or other types
-    if str(type(features)) == "<class 'pandas.core.frame.DataFrame'>":
-        if feature_names is None:
-            feature_names = features.columns
-        features = features.as_matrix()
-    elif str(type(features)) == "<class 'list'>":
+    features, feature_names = _to_ndarray(features, feature_names)
+    if isinstance(features, list):
         if feature_names is None:
             feature_names = features
         features = None
@@ -203,17 +238,29 @@ def summary_plot(shap_values, features, feature_names=None, max_display=20, plot
         features = None
 
     if sort:
-        # order features by the sum of their effect magnitudes
-        feature_order = np.argsort(np.sum(np.abs(shap_values), axis=0)[:-1])
-        feature_order = feature_order[-min(max_display,len(feature_order)):]
+        # order features by the sum of their effect magnitudes, only sorting the ones we display
+        feature_mags = np.sum(np.abs(shap_values[:,:-1]), axis=0)
+        num_display = min(max_display, len(feature_mags))
+        feature_order = np.argpartition(feature_mags, -num_display)[-num_display:]
+        feature_order = feature_order[np.argsort(feature_mags[feature_order])]
     else:
         feature_order = np.arange(min(max_display,shap_values.shape[1]-1))
 
+    # the color range of every displayed feature in a single pass
+    if features is not None:
+        vmins,vmaxs = np.nanpercentile(features[:,feature_order], [5, 95], axis=0)
+
     row_height = 0.4
     pl.gcf().set_size_inches(7, len(feature_order)*row_height+0.6)
     pl.axvline(x=0, color="#999999", zorder=-1)
 
     if plot_type == "dot":
+        if features is not None:
+            # fill in missing values once for all the displayed features
+            feature_values = np.nan_to_num(features[:,feature_order])
+        rasterize = rasterize and features is not None and _can_rasterize(shap_values.shape[0])
+        if rasterize:
+            shap_range = _padded_range(shap_values[:,feature_order])
         for pos,i in enumerate(feature_order):
             pl.axhline(y=pos, color="#cccccc", lw=0.5, dashes=(1,5), zorder=-1)
             shaps = shap_values[:,i]
@@ -223,22 +270,23 @@ def summary_plot(shap_values, features, feature_names=None, max_display=20, plot
             nbins = 100
             quant = np.round(nbins*(shap_values[:,i] - np.min(shaps))/(np.max(shaps)-np.min(shaps)+1e-8))
             inds = np.argsort(quant+np.random.randn(N)*1e-6)
-            layer = 0
-            last_bin = -1
+
+            # each point's layer is its rank within its bin, alternating above and below the row
+            pos_sorted = np.arange(N)
+            bin_start = np.maximum.accumulate(np.where(np.r_[True, np.diff(quant[inds]) != 0], pos_sorted, 0))
+            layer = pos_sorted - bin_start
             ys = np.zeros(N)
-            for ind in inds:
-                if quant[ind] != last_bin:
-                    layer = 0
-                ys[ind] = layer * ((layer%2)*2-1)
-                layer += 1
-                last_bin = quant[ind]
+            ys[inds] = layer * ((layer%2)*2-1)
             ys *= row_height/np.max(ys)
 
             if features is not None:
-                vmin = np.nanpercentile(features[:,i], 5)
-                vmax = np.nanpercentile(features[:,i], 95)
                 assert features.shape[0] == len(shaps), "Feature and SHAP matrices must have the same number of rows!"
-                pl.scatter(shaps, pos+ys, cmap=red_blue, vmin=vmin, vmax=vmax, s=16, c=np.nan_to_num(features[:,i]), alpha=alpha, linewidth=0, zorder=3)
+                if rasterize:
+                    _rasterized_scatter(shaps, pos+ys, feature_values[:,pos], red_blue, vmins[pos], vmaxs[pos],
+                                        alpha=alpha, zorder=3, x_range=shap_range, y_range=(pos-row_height, pos+row_height),
+                                        height=int(pl.gca().get_window_extent().height*2*row_height/(len(feature_order)+1)))
+                else:
+                    pl.scatter(shaps, pos+ys, cmap=red_blue, vmin=vmins[pos], vmax=vmaxs[pos], s=16, c=feature_values[:,pos], alpha=alpha, linewidth=0, zorder=3)
             else:
                 pl.scatter(shaps, pos+ys, s=16, alpha=alpha, linewidth=0, zorder=3, color=color)
 
@@ -247,39 +295,56 @@ def summary_plot(shap_values, features, feature_names=None, max_display=20, plot
             pl.axhline(y=pos, color="#cccccc", lw=0.5, dashes=(1,5), zorder=-1)
 
         if features is not None:
-            global_low = np.nanpercentile(shap_values[:,:len(feature_names)].flatten(), 1)
-            global_high = np.nanpercentile(shap_values[:,:len(feature_names)].flatten(), 99)
+            global_low,global_high = np.nanpercentile(shap_values[:,:len(feature_names)], [1, 99], axis=None)
+
             for pos,i in enumerate(feature_order):
                 shaps = shap_values[:,i]
                 shap_min,shap_max = np.min(shaps),np.max(shaps)
                 rng = shap_max-shap_min
                 xs = np.linspace(np.min(shaps)-rng*0.2, np.max(shaps)+rng*0.2, 100)
                 if np.std(shaps) < (global_high-global_low)/100:
-                    ds = gaussian_kde(shaps + np.random.randn(len(shaps))*(global_high-global_low)/100)(xs)
+                    ds = _fft_kde(shaps + np.random.randn(len(shaps))*(global_high-global_low)/100, xs)
                 else:
-                    ds = gaussian_kde(shaps)(xs)
+                    ds = _fft_kde(shaps, xs)
                 ds /= np.max(ds)*3
 
+                # average the feature values of the samples whose SHAP values are nearest each segment
                 values = features[:,i]
                 window_size = max(10, len(values)//20)
-                smooth_values = np.zeros(len(xs)-1)
-                for j in range(len(xs)-1):
-                    smooth_values[j] = np.mean(values[max(0,j-window_size):min(len(xs),j+window_size)])
+                shap_order = np.argsort(shaps)
+                sorted_values = values[shap_order]
+                nan_mask = np.isnan(sorted_values)
+                csum = np.concatenate(([0], np.cumsum(np.where(nan_mask, 0, sorted_values))))
+                ccount = np.concatenate(([0], np.cumsum(~nan_mask)))
+                centers = np.searchsorted(shaps[shap_order], (xs[:-1] + xs[1:]) / 2)
+                left = np.maximum(0, centers - window_size)
+                right = np.minimum(len(values), centers + window_size)
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    smooth_values = (csum[right] - csum[left]) / (ccount[right] - ccount[left])
 
 
 
-                vmin = np.nanpercentile(values, 5)
-                vmax = np.nanpercentile(values, 95)
+                vmin,vmax = vmins[pos],vmaxs[pos]
                 # smooth_values -= np.nanpercentile(smooth_values, 5)
                 # smooth_values /= np.nanpercentile(smooth_values, 95)
                 smooth_values -= vmin
                 smooth_values /= vmax-vmin
-                for i in range(len(xs)-1):
-                    if ds[i] > 0.05 or ds[i+1] > 0.05:
-                        pl.fill_between([xs[i],xs[i+1]], [pos+ds[i],pos+ds[i+1]], [pos-ds[i],pos-ds[i+1]], color=red_blue(smooth_values[i]), zorder=2)
 
-                vmin = np.nanpercentile(values, 5)
-                vmax = np.nanpercentile(values, 95)
+                # draw all the visible segments of the violin as a single collection of quads
+                visible = (ds[:-1] > 0.05) | (ds[1:] > 0.05)
+                x0,x1 = xs[:-1][visible],xs[1:][visible]
+                d0,d1 = ds[:-1][visible],ds[1:][visible]
+                verts = np.stack([
+                    np.stack([x0, pos+d0], axis=1), np.stack([x1, pos+d1], axis=1),
+                    np.stack([x1, pos-d1], axis=1), np.stack([x0, pos-d0], axis=1)
+                ], axis=1)
+                segment_values = smooth_values[visible]
+                missing = np.isnan(segment_values)
+                lut_inds = (np.clip(np.where(missing, 0, segment_values), 0, 1)*red_blue.N).astype(int)
+                colors = red_blue_lut[np.minimum(lut_inds, red_blue.N-1)]
+                colors[missing] = red_blue(np.nan)
+                pl.gca().add_collection(PolyCollection(verts, facecolors=colors, edgecolors=colors, zorder=2))
+
                 pl.scatter(shaps, np.ones(shap_values.shape[0])*pos, s=9, cmap=red_blue, vmin=vmin, vmax=vmax, c=values, alpha=alpha, linewidth=0, zorder=3)
 
         else:
@@ -304,6 +369,105 @@ def summary_plot(shap_values, features, feature_names=None, max_display=20, plot
     pl.xlabel("SHAP value (impact on model output)", fontsize=13)
     if show: pl.show()
 
+def _unique_names(values):
+    """ The sorted distinct non-missing values and the index of one occurrence of each.
+
+    This is np.unique(values, return_index=True), except missing values (which can't be sorted
+    alongside strings) are left out.
+    """
+
+    missing = pd.isnull(values) if pd is not None else values != values
+    present = np.flatnonzero(~missing)
+    names,inds = np.unique(values[present], return_index=True)
+    return names,present[inds]
+
+def _to_ndarray(features, feature_names):
+    """ Unwrap a pandas DataFrame or Series into a numpy array, taking the feature names from it if needed. """
+
+    if pd is not None:
+        if isinstance(features, pd.DataFrame):
+            if feature_names is None:
+                feature_names = list(features.columns)
+            features = features.to_numpy(copy=False)
+        elif isinstance(features, pd.Series):
+            if feature_names is None:
+                feature_names = list(features.index)
+            features = features.to_numpy(copy=False)
+    return features, feature_names
+
+# plots with more points than this are drawn as images when rasterize=True
+rasterize_min_points = 50000
+
+def _can_rasterize(num_points):
+    """ Rasterizing only pays off for large plots, and needs datashader to be installed. """
+
+    if num_points <= rasterize_min_points:
+        return False
+    try:
+        import datashader
+    except ImportError:
+        warnings.warn("datashader is not installed, so the plot will not be rasterized")
+        return False
+    return True
+
+def _rasterized_scatter(x, y, c, cmap, vmin, vmax, dot_size=16, alpha=1, zorder=None, x_range=None, y_range=None,
+                        width=None, height=None):
+    """ Draw a scatter plot as an image of the mean color value of the points near each pixel.
+
+    The canvas defaults to the pixel size of the current axes, and every point is spread over a disc
+    the size of a scatter marker of area dot_size, so sparse points stay as visible as real dots.
+    """
+
+    import datashader
+    import datashader.transfer_functions as tf
+
+    x_range = _padded_range(x) if x_range is None else x_range
+    y_range = _padded_range(y) if y_range is None else y_range
+    bbox = pl.gca().get_window_extent()
+    width = max(int(bbox.width), 1) if width is None else width
+    height = max(int(bbox.height), 1) if height is None else height
+    df = pd.DataFrame({"x": x, "y": y, "c": np.asarray(c, dtype=np.float64)})
+    canvas = datashader.Canvas(plot_width=width, plot_height=height, x_range=x_range, y_range=y_range)
+    agg = canvas.points(df, "x", "y", datashader.summary(total=datashader.sum("c"), count=datashader.count("c")))
+
+    # spread the sums and counts separately so overlapping discs average their colors
+    px = max(int(round(np.sqrt(dot_size)*pl.gcf().dpi/72/2)), 1)
+    total = tf.spread(agg["total"], px=px, how="add").values
+    count = tf.spread(agg["count"], px=px, how="add").values
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.where(count > 0, total/count, np.nan)
+    return pl.imshow(mean, extent=x_range+y_range, origin="lower", aspect="auto", interpolation="nearest",
+                     cmap=cmap, vmin=vmin, vmax=vmax, alpha=alpha, zorder=zorder)
+
+def _padded_range(v):
+    """ The (min, max) of v widened by 5% on each side, or by 0.5 when v is constant. """
+
+    vmin,vmax = np.nanmin(v), np.nanmax(v)
+    pad = (vmax-vmin)*0.05 if vmax > vmin else 0.5
+    return (vmin-pad, vmax+pad)
+
+def _fft_kde(values, xs, grid_size=512):
+    """ Evaluate a Gaussian KDE of values at xs by convolving a histogram over a uniform grid.
+
+    The grid spans both xs and values, and the bandwidth follows Scott's rule like
+    scipy.stats.gaussian_kde, but is never narrower than one grid step.
+    """
+
+    low,high = min(np.min(xs), np.min(values)), max(np.max(xs), np.max(values))
+    if high <= low:
+        low,high = low-0.5, high+0.5
+    grid = np.linspace(low, high, grid_size)
+    dx = grid[1] - grid[0]
+    hist,_ = np.histogram(values, bins=len(grid), range=(grid[0]-dx/2, grid[-1]+dx/2))
+
+    sigma = max(np.std(values, ddof=1) * len(values)**(-0.2) / dx, 1.0)
+    half_width = min(int(np.ceil(4*sigma)), len(grid))
+    kernel = np.exp(-0.5*(np.arange(-half_width, half_width+1)/sigma)**2)
+    kernel /= np.sum(kernel)
+
+    density = np.maximum(fftconvolve(hist, kernel, mode="same"), 0) / (len(values)*dx)
+    return np.interp(xs, grid, density)
+
 def visualize(shap_values, features=None, feature_names=None, out_names=None, data=None):
     """ Visualize the given SHAP values with an additive force layout. """
 
@@ -317,15 +481,8 @@ def visualize(shap_values, features=None, feature_names=None, out_names=None, da
         return iml.visualize(shap_values)
 
     # convert from a DataFrame or other types
-    if str(type(features)) == "<class 'pandas.core.frame.DataFrame'>":
-        if feature_names is None:
-            feature_names = list(features.columns)
-        features = features.as_matrix()
-    elif str(type(features)) == "<class 'pandas.core.series.Series'>":
-        if feature_names is None:
-            feature_names = list(features.index)
-        features = features.as_matrix()
-    elif str(type(features)) == "list":
+    features, feature_names = _to_ndarray(features, feature_names)
+    if isinstance(features, list):
         if feature_names is None:
             feature_names = features
         features = None
@@ -389,10 +546,7 @@ def joint_plot(ind, X, shap_value_matrix, feature_names=None, other_ind=None, ot
     warnings.warn("shap.joint_plot is not yet finalized and should be used with caution")
 
     # convert from a DataFrame if we got one
-    if str(type(X)) == "<class 'pandas.core.frame.DataFrame'>":
-        if feature_names is None:
-            feature_names = X.columns
-        X = X.as_matrix()
+    X, feature_names = _to_ndarray(X, feature_names)
     if feature_names is None:
         feature_names = ["Feature %d"%i for i in range(X.shape[1])]
 
@@ -407,34 +561,36 @@ def joint_plot(ind, X, shap_value_matrix, feature_names=None, other_ind=None, ot
 
     joint_shap_values = shap_value_matrix[:,ind] + shap_value_matrix[:,other_ind]
 
-    if type(x[0]) == str:
-        xnames = list(set(x))
-        xnames.sort()
-        name_map = {n: i for i,n in enumerate(xnames)}
-        xv = [name_map[v] for v in x]
+    # map string values to their sorted position so they can be plotted
+    x_is_str = x.dtype.kind in "US" or type(x[0]) == str
+    if x_is_str:
+        xnames = np.unique(x)
+        xv = np.searchsorted(xnames, x).astype(np.float64)
     else:
         xv = x
 
-    if type(y[0]) == str:
-        ynames = list(set(y))
-        ynames.sort()
-        name_map = {n: i for i,n in enumerate(ynames)}
-        yv = [name_map[v] for v in y]
+    y_is_str = y.dtype.kind in "US" or type(y[0]) == str
+    if y_is_str:
+        ynames = np.unique(y)
+        yv = np.searchsorted(ynames, y).astype(np.float64)
     else:
         yv = y
 
-    sc = pl.scatter(x, y, s=20, c=joint_shap_values, edgecolor='', alpha=alpha, cmap=red_blue)
+    sc = pl.scatter(xv, yv, s=20, c=joint_shap_values, linewidth=0, alpha=alpha, cmap=red_blue)
     pl.xlabel(xname, color=axis_color)
     pl.ylabel(yname, color=axis_color)
     cb = pl.colorbar(sc, label="Joint SHAP value")
     cb.set_alpha(1)
-    cb.draw_all()
+    if hasattr(cb, "draw_all"): # removed in newer matplotlib versions, which redraw automatically
+        cb.draw_all()
 
     pl.gca().tick_params(color=axis_color, labelcolor=axis_color)
     for spine in pl.gca().spines.values():
         spine.set_edgecolor(axis_color)
-    if type(x[0]) == str:
-        pl.xticks([name_map[n] for n in xnames], xnames, rotation='vertical')
+    if x_is_str:
+        pl.xticks(range(len(xnames)), xnames, rotation='vertical')
+    if y_is_str:
+        pl.yticks(range(len(ynames)), ynames)
     if show:
         pl.show()
 
@@ -442,19 +598,15 @@ def interaction_plot(ind, X, shap_value_matrix, feature_names=None, interaction_
     warnings.warn("shap.interaction_plot is deprecated in favor of shap.dependence_plot")
 
     # convert from a DataFrame if we got one
-    if str(type(X)) == "<class 'pandas.core.frame.DataFrame'>":
-        if feature_names is None:
-            feature_names = X.columns
-        X = X.as_matrix()
+    X, feature_names = _to_ndarray(X, feature_names)
 
     x = X[:,ind]
     name = feature_names[ind]
     shap_values = shap_value_matrix[:,ind]
-    if type(x[0]) == str:
-        xnames = list(set(x))
-        xnames.sort()
-        name_map = {n: i for i,n in enumerate(xnames)}
-        xv = [name_map[v] for v in x]
+    x_is_str = x.dtype.kind in "US" or type(x[0]) == str
+    if x_is_str:
+        xnames = np.unique(x)
+        xv = np.searchsorted(xnames, x).astype(np.float64)
     else:
         xv = x
 
@@ -476,8 +628,8 @@ def interaction_plot(ind, X, shap_value_matrix, feature_names=None, interaction_
     pl.gca().tick_params(color=axis_color, labelcolor=axis_color)
     for spine in pl.gca().spines.values():
         spine.set_edgecolor(axis_color)
-    if type(x[0]) == str:
-        pl.xticks([name_map[n] for n in xnames], xnames, rotation='vertical')
+    if x_is_str:
+        pl.xticks(range(len(xnames)), xnames, rotation='vertical')
     if show:
         pl.show()
 
@@ -485,10 +637,8 @@ def plot(x, shap_values, name, color="#ff0052", axis_color="#333333", alpha=1, t
     warnings.warn("shap.plot is deprecated in favor of shap.dependence_plot")
 
     if type(x[0]) == str:
-        xnames = list(set(x))
-        xnames.sort()
-        name_map = {n: i for i,n in enumerate(xnames)}
-        xv = [name_map[v] for v in x]
+        xnames = np.unique(x)
+        xv = np.searchsorted(xnames, x)
     else:
         xv = x
 
@@ -507,6 +657,6 @@ def plot(x, shap_values, name, color="#ff0052", axis_color="#333333", alpha=1, t
     for spine in pl.gca().spines.values():
         spine.set_edgecolor(axis_color)
     if type(x[0]) == str:
-        pl.xticks([name_map[n] for n in xnames], xnames, rotation='vertical')
+        pl.xticks(range(len(xnames)), xnames, rotation='vertical')
     if show:
         pl.show()
@@ -0,0 +1,107 @@
+import unittest
+import shap
+import numpy as np
+
+def test_approx_interactions():
+    np.random.seed(0)
+    X = np.random.randn(1000, 5)
+    X[:,3] = 0
+    shap_values = np.random.randn(1000, 6) * 0.1
+    shap_values[:,0] += X[:,0] * X[:,2]
+    order = shap.plots.approx_interactions(0, shap_values, X)
+    assert order[0] == 2
+    assert set(order) == set(range(5))
+
+def test_score_interactions_kernels_agree():
+    try:
+        from shap._interactions_numba import score_interactions
+    except ImportError:
+        raise unittest.SkipTest("numba is not installed")
+    np.random.seed(0)
+    shap_ref = np.random.randn(1000)
+    Xs = np.asfortranarray(np.random.randn(1000, 6))
+    Xs[:,2] = 0.1
+    Xs[:,3] = np.round(Xs[:,3])
+    Xs[np.random.rand(1000) < 0.3,4] = np.nan
+    cols = np.array([0, 1, 3, 4, 5])
+    expected = shap.plots._score_interactions_numpy(shap_ref, Xs, 50, cols)
+    assert np.allclose(score_interactions(shap_ref, Xs, 50, cols), expected)
+    assert expected[2] == 0
+
+def test_fft_kde_matches_gaussian_kde():
+    from scipy.stats import gaussian_kde
+    np.random.seed(0)
+    for values in [np.random.standard_t(2, 2000), np.random.randn(2000)*0.3, np.random.randn(2000)*0.05]:
+        spread = np.max(values) - np.min(values)
+        xs = np.linspace(np.min(values)-spread*0.2, np.max(values)+spread*0.2, 100)
+        expected = gaussian_kde(values)(xs)
+        ds = shap.plots._fft_kde(values, xs)
+        assert np.max(np.abs(ds/np.max(ds) - expected/np.max(expected))) < 0.02
+
+def _summary_shap_values(N, F):
+    np.random.seed(0)
+    X = np.random.randn(N, F)
+    shap_values = np.hstack([np.random.randn(N, F) * X, np.zeros((N, 1))])
+    return shap_values, X, ["f%d" % i for i in range(F)]
+
+def test_summary_plot_small_not_rasterized():
+    import matplotlib.pyplot as pl
+    import warnings
+    shap_values, X, names = _summary_shap_values(1000, 3)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        shap.summary_plot(shap_values, X, names, show=False, rasterize=True)
+    assert len(pl.gca().images) == 0
+    pl.close("all")
+
+def test_summary_plot_rasterized():
+    try:
+        import datashader
+    except ImportError:
+        raise unittest.SkipTest("datashader is not installed")
+    import matplotlib.pyplot as pl
+    shap_values, X, names = _summary_shap_values(60000, 3)
+    shap.summary_plot(shap_values, X, names, show=False, rasterize=True)
+    assert len(pl.gca().images) == 3
+    pl.close("all")
+
+def test_approx_interactions_subsample_follows_seed():
+    np.random.seed(0)
+    X = np.random.randn(12000, 20)
+    shap_values = np.random.randn(12000, 21)
+    np.random.seed(1)
+    first = shap.plots.approx_interactions(0, shap_values, X)
+    np.random.seed(1)
+    second = shap.plots.approx_interactions(0, shap_values, X)
+    assert np.array_equal(first, second)
+
+def test_unique_names_skips_missing():
+    values = np.array(["b", "a", np.nan, "b", None, "c"], dtype=object)
+    names, inds = shap.plots._unique_names(values)
+    assert list(names) == ["a", "b", "c"]
+    assert list(values[inds]) == ["a", "b", "c"]
+
+def test_summary_plot_violin_missing_feature_is_transparent():
+    import matplotlib.pyplot as pl
+    from matplotlib.collections import PolyCollection
+    shap_values, X, names = _summary_shap_values(1000, 2)
+    X[:,0] = np.nan
+    shap.summary_plot(shap_values, X, names, plot_type="violin", show=False)
+    violins = [c for c in pl.gca().collections if type(c) == PolyCollection]
+    alphas = [c.get_facecolors()[:,3] for c in violins]
+    assert sum(np.all(a == 0) for a in alphas) == 1
+    pl.close("all")
+
+def test_joint_plot_string_features():
+    import matplotlib.pyplot as pl
+    np.random.seed(0)
+    X = np.empty((300, 2), dtype=object)
+    X[:,0] = np.random.choice(["lo", "mid", "hi"], 300)
+    X[:,1] = np.random.choice(["x", "y"], 300)
+    shap_values = np.hstack([np.random.randn(300, 2), np.zeros((300, 1))])
+    shap.joint_plot(0, X, shap_values, ["a", "b"], other_ind=1, show=False)
+    ax = pl.gcf().axes[0]
+    assert [t.get_text() for t in ax.get_xticklabels()] == ["hi", "lo", "mid"]
+    assert [t.get_text() for t in ax.get_yticklabels()] == ["x", "y"]
+    assert set(map(tuple, ax.collections[0].get_offsets())) <= {(i, j) for i in range(3) for j in range(2)}
+    pl.close("all")